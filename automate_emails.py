@@ -2,19 +2,23 @@
 """Automates sending emails to recruiters."""
 
 import argparse
+import base64
 import csv
 import datetime
 import json
 import logging
 import os
 import sys
-from email.message import EmailMessage
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage, MIMEPart
+from functools import cache, partial
+from operator import itemgetter
 from pathlib import Path
 from string import Template
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple
 from zoneinfo import ZoneInfo
 
-from dotenv import load_dotenv
-
 import utils.schedule_helper as sh
 from utils.customformatter import CustomFormatter
 from utils.email_args import (
@@ -24,19 +28,55 @@ from utils.email_args import (
     get_arg_or_env,
     get_bool_arg_or_env,
 )
-from utils.gmail import GmailAPI
-from utils.streak import StreakSendLaterConfig, schedule_send_later
-
-load_dotenv()
 
-logging.getLogger().setLevel(int(os.getenv("LOG_LEVEL", logging.INFO)))
-# set the default formatter to use CustomFormatter as the handler
-handler = logging.StreamHandler()
-handler.setFormatter(CustomFormatter())
-logging.getLogger().addHandler(handler)
+if TYPE_CHECKING:
+    from utils.gmail import GmailAPI
 
 logger = logging.getLogger(__name__)
 
+# Base64 encodes 57 bytes per 76 character line, so reading attachments in
+# multiples of 57 bytes keeps every encoded chunk on line boundaries (~64 KB).
+ATTACHMENT_CHUNK_SIZE = 57 * 1150
+
+# When the current time is within an allowed range, send this far in the future
+# to allow sufficient time for the user to edit the draft in case of any errors.
+DRAFT_EDIT_DELAY = datetime.timedelta(minutes=10)
+
+# Recipients CSV columns, in Recipient field order
+RECIPIENT_COLUMNS = ("RECRUITER_COMPANY", "RECRUITER_NAME", "RECRUITER_EMAIL")
+
+# Token JSON key caching the account's email address between runs
+EMAIL_ADDRESS_KEY = "email_address"
+
+
+def load_environment() -> None:
+    """Load the .env file, then configure the root logger at its LOG_LEVEL."""
+    from dotenv import load_dotenv  # noqa: PLC0415
+
+    load_dotenv()
+    configure_logging()
+
+
+def configure_logging() -> None:
+    """Configure the root logger to use CustomFormatter at LOG_LEVEL."""
+    root_logger = logging.getLogger()
+    root_logger.setLevel(int(os.getenv("LOG_LEVEL", logging.INFO)))
+    # Configuring twice in one process must not print every log line twice
+    if any(isinstance(h.formatter, CustomFormatter) for h in root_logger.handlers):
+        return
+    # set the default formatter to use CustomFormatter as the handler
+    handler = logging.StreamHandler()
+    handler.setFormatter(CustomFormatter())
+    root_logger.addHandler(handler)
+
+
+class Recipient(NamedTuple):
+    """A recruiter to draft an email for."""
+
+    company: str
+    name: str
+    email: str
+
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
@@ -48,6 +88,61 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+@cache
+def compile_template(s: str) -> Template:
+    """
+    Compile a string into a Template, reusing previously compiled templates.
+
+    s: The template string.
+
+    Returns the cached Template object for the string.
+    """
+    return Template(s)
+
+
+@cache
+def compile_renderer(s: str) -> Callable[..., str]:
+    """
+    Compile a template string into a function that renders it.
+
+    s: The template string.
+
+    The template is split once into constant fragments and placeholder names,
+    so rendering only joins the fragments with the substituted values. The
+    result and errors match Template.substitute.
+
+    Returns the cached render function taking the placeholder values as kwargs.
+    """
+    fragments: list[str] = []
+    names: list[str] = []
+    literal: list[str] = []
+    position = 0
+    for match in Template.pattern.finditer(s):
+        literal.append(s[position : match.start()])
+        position = match.end()
+        if match["escaped"] is not None:
+            literal.append("$")
+            continue
+        name = match["named"] or match["braced"]
+        if name is None:
+            # Invalid placeholder, let Template raise its usual ValueError
+            return compile_template(s).substitute
+        fragments.append("".join(literal))
+        literal = []
+        names.append(name)
+    literal.append(s[position:])
+    fragments.append("".join(literal))
+
+    def render(**kwargs: str) -> str:
+        parts = [fragments[0]]
+        for name, fragment in zip(names, fragments[1:], strict=True):
+            parts.append(str(kwargs[name]))
+            parts.append(fragment)
+        return "".join(parts)
+
+    return render
+
+
 def process_string(s: str, **kwargs: dict) -> str:
     """
     Process a file and substitute placeholders with values.
@@ -59,15 +154,135 @@ def process_string(s: str, **kwargs: dict) -> str:
 
     Returns the processed string as a string.
     """
-    template = Template(s)
-    return template.substitute(**kwargs)
+    if "$" not in s:
+        # No placeholders, nothing to substitute
+        return s
+    return compile_renderer(s)(**kwargs)
+
+
+def read_recipients_csv(csv_path: Path) -> list[Recipient]:
+    """
+    Read the recruiters to email from a CSV file.
+
+    csv_path: The path to a CSV file with RECRUITER_COMPANY, RECRUITER_NAME and
+    RECRUITER_EMAIL columns.
+
+    Blank lines and rows missing a column are skipped. Exits when the header is
+    missing one of the columns.
+
+    Returns a list of recipients in the order they appear in the file.
+    """
+    with csv_path.open("r", newline="") as file:
+        csv_reader = csv.reader(file, skipinitialspace=True)
+        header = next(csv_reader, [])
+        missing = [column for column in RECIPIENT_COLUMNS if column not in header]
+        if missing:
+            logger.error(
+                "Recipients CSV %s is missing columns: %s",
+                csv_path,
+                ", ".join(missing),
+            )
+            sys.exit(1)
+        # Pick the columns by position so no dict is built per row
+        columns = [header.index(column) for column in RECIPIENT_COLUMNS]
+        get_fields = itemgetter(*columns)
+        min_row_length = max(columns) + 1
+        recipients = []
+        for row in csv_reader:
+            if not row:
+                # Blank lines, such as a trailing newline, have no recipient
+                continue
+            if len(row) < min_row_length:
+                logger.warning(
+                    "Skipping incomplete row %d in %s", csv_reader.line_num, csv_path
+                )
+                continue
+            recipients.append(Recipient._make(get_fields(row)))
+        return recipients
+
+
+def get_recipients(
+    args: argparse.Namespace, recipients_csv_path: str | None
+) -> list[Recipient]:
+    """
+    Get the recruiters to email from the recipients CSV or the arguments.
+
+    args: The parsed command line arguments.
+    recipients_csv_path: The path to the recipients CSV, if one was provided.
+
+    Recruiter arguments take precedence over a CSV path that only comes from
+    the environment. Exits when they are given along with --recipients_csv,
+    or when they are used and incomplete.
+
+    Returns the recipients, which is empty for a CSV without rows.
+    """
+    recruiter_args = (args.recruiter_company, args.recruiter_name, args.recruiter_email)
+    if any(recruiter_args):
+        if args.recipients_csv:
+            logger.error(
+                "recruiter_company, recruiter_name and recruiter_email cannot be "
+                "combined with recipients_csv"
+            )
+            sys.exit(1)
+    elif recipients_csv_path:
+        return read_recipients_csv(Path(recipients_csv_path))
+    if all(recruiter_args):
+        return [
+            Recipient(
+                company=args.recruiter_company,
+                name=args.recruiter_name,
+                email=args.recruiter_email,
+            )
+        ]
+    logger.error(
+        "recruiter_company, recruiter_name and recruiter_email are required "
+        "unless recipients_csv is provided"
+    )
+    sys.exit(1)
+
+
+def create_attachment_part(file: BinaryIO, filename: str) -> MIMEPart:
+    """
+    Create a base64 encoded attachment part by streaming a file in chunks.
+
+    file: The attachment file opened in binary mode.
+    filename: The name to give the attachment.
+
+    Returns a MIMEPart that can be passed as the attachment of an email message.
+    """
+    encoded = bytearray()
+    for chunk in iter(partial(file.read, ATTACHMENT_CHUNK_SIZE), b""):
+        encoded += base64.encodebytes(chunk)
+    part = MIMEPart()
+    part["Content-Type"] = "application/octet-stream"
+    part["Content-Transfer-Encoding"] = "base64"
+    part.add_header("Content-Disposition", "attachment", filename=filename)
+    part.set_payload(encoded.decode("ascii"))
+    return part
+
+
+def read_attachment_part(
+    attachment_path: str | None, attachment_name: str | None
+) -> MIMEPart | None:
+    """
+    Read the attachment file into an attachment part, if there is one.
+
+    attachment_path: The path to the attachment file, if any.
+    attachment_name: The name to give the attachment.
+
+    Returns the part from create_attachment_part, or None without a path.
+    """
+    if not attachment_path:
+        return None
+    with Path(attachment_path).open("rb") as attachment_file:
+        return create_attachment_part(attachment_file, attachment_name)
 
 
 def create_email_message(
     message_body: str,
     to_address: str,
     subject: str,
-    attachment: bytes | None = None,
+    attachment: bytes | MIMEPart | None = None,
     attachment_name: str | None = None,
 ) -> EmailMessage:
     """
@@ -76,14 +291,18 @@ def create_email_message(
     message_body: The body of the email message.
     to_address: The email address of the recipient.
     subject: The subject of the email message.
-    attachment: The path to the attachment file, if any.
+    attachment: The attachment contents or a part from create_attachment_part.
+    attachment_name: The name of the attachment file, required for contents.
 
     Returns an EmailMessage object.
     """
     message = EmailMessage()
 
     message.set_content(message_body, subtype="html")
-    if attachment:
+    if isinstance(attachment, MIMEPart):
+        message.make_mixed()
+        message.attach(attachment)
+    elif attachment:
         if attachment_name:
             message.add_attachment(
                 attachment,
@@ -100,66 +319,206 @@ def create_email_message(
     return message
 
 
-def schedule_send(
+def build_email_messages(
+    recipients: list[Recipient],
+    template: str,
+    subject: str,
+    attachment: bytes | MIMEPart | None = None,
+    attachment_name: str | None = None,
+) -> list[EmailMessage]:
+    """
+    Create an email message for every recipient.
+
+    recipients: The recruiters to email.
+    template: The message body template.
+    subject: The subject template.
+    attachment: The attachment contents or a part from create_attachment_part.
+    attachment_name: The name of the attachment file, required for contents.
+
+    The template, subject and attachment are prepared once by the caller and
+    shared by every message, so only the substitution runs per recipient.
+
+    Returns the email messages in the same order as recipients.
+    """
+    email_messages = []
+    for recipient in recipients:
+        email_contents = process_string(
+            template,
+            recruiter_name=recipient.name,
+            recruiter_company=recipient.company,
+        )
+        email_messages.append(
+            create_email_message(
+                email_contents,
+                recipient.email,
+                process_string(subject, recruiter_company=recipient.company),
+                attachment=attachment,
+                attachment_name=attachment_name,
+            )
+        )
+        logger.info(
+            "Recruiter email: %s, Recruiter Name: %s, Recruiter Company: %s",
+            recipient.email,
+            recipient.name,
+            recipient.company,
+        )
+    return email_messages
+
+
+def schedule_send(  # noqa: PLR0913, PLR0917
     timezone: str,
     csv_path: str,
-    draft: dict,
+    drafts: list[dict | bool],
+    messages: list[EmailMessage],
     streak_token: str,
     streak_email_address: str,
-) -> bool:
+) -> list[bool]:
     """
-    Schedule the email to be sent later using Streak.
+    Schedule the emails to be sent later using Streak.
 
     timezone: The timezone to use for scheduling.
     csv_path: The path to the CSV file containing the schedule.
-    draft: The draft email object.
+    drafts: The draft email objects, False for drafts that failed to save.
+    messages: The email messages the drafts were created from.
     streak_token: The Streak API token.
     streak_email_address: The email address to use in Streak scheduling.
+
+    Returns whether each draft was scheduled, in the same order as drafts.
     """
+    # Imported here so runs that do not schedule skip loading requests
+    from utils.streak import (  # noqa: PLC0415
+        StreakSendLaterConfig,
+        schedule_send_later_many,
+    )
+
     if not streak_token:
         logger.error("Scheduling error: No streak token provided.")
-        return False
+        return [False] * len(drafts)
     if not csv_path:
         logger.error("Scheduling error: No schedule csv file provided.")
-        return False
+        return [False] * len(drafts)
     csv_path = Path(csv_path)
     if not csv_path.exists():
         logger.error("Scheduling Error: No schedule csv file found.")
-        return False
+        return [False] * len(drafts)
     if not streak_email_address:
         logger.warning(
             "Scheduling warning %s not provided. Streak scheduling may not work as \
             expected",
             EnvironmentVariables.STREAK_EMAIL_ADDRESS.value,
         )
-    with csv_path.open("r") as file:
-        csv_reader = csv.DictReader(file)
-        day_ranges = sh.parse_time_ranges_csv(csv_reader)
-
-    send_time = sh.get_scheduled_send_time(day_ranges, timezone)
-    if send_time is True:
-        # current time is within allowed range
-        # send time should be 10 minutes from now to allow sufficient time for user to
-        # edit the draft in case of any errors.
-        send_time = datetime.datetime.now(tz=ZoneInfo(timezone)) + datetime.timedelta(
-            minutes=10
+    try:
+        day_ranges = sh.load_time_ranges_csv(csv_path)
+    except ValueError as e:
+        logger.error("Scheduling error: %s", e)  # noqa: TRY400 no traceback needed
+        return [False] * len(drafts)
+
+    configs = []
+    tz = ZoneInfo(timezone)
+    for draft, message in zip(drafts, messages, strict=True):
+        if not draft:
+            logger.error("No draft saved for %s, skipping scheduling", message["To"])
+            continue
+        now = datetime.datetime.now(tz=tz)
+        send_time = sh.get_scheduled_send_time(day_ranges, timezone, now)
+        if send_time is True:
+            # current time is within allowed range
+            send_time = now + DRAFT_EDIT_DELAY
+        configs.append(
+            StreakSendLaterConfig(
+                token=streak_token,
+                to_address=message["To"],
+                subject=message["Subject"],
+                thread_id=draft["message"]["threadId"],
+                draft_id=draft["id"],
+                send_date=send_time,
+                is_tracked=True,
+                email_address=streak_email_address,
+            )
         )
-    config = StreakSendLaterConfig(
-        token=streak_token,
-        to_address=args.recruiter_email,
-        subject=subject,
-        thread_id=draft["message"]["threadId"],
-        draft_id=draft["id"],
-        send_date=send_time,
-        is_tracked=True,
-        email_address=streak_email_address,
-    )
-    return schedule_send_later(config)
+    scheduled = iter(schedule_send_later_many(configs))
+    return [next(scheduled) if draft else False for draft in drafts]
 
 
-if __name__ == "__main__":
+def login(gmail_api: "GmailAPI", token_path: Path, creds_path: Path) -> dict:
+    """
+    Log in to Gmail with the saved token, falling back to the credentials file.
+
+    gmail_api: The GmailAPI object to log in with.
+    token_path: The path to the token JSON file.
+    creds_path: The path to the credentials JSON file, used when there is no token.
+
+    The token file is only rewritten when the credentials were refreshed or
+    created, so repeat runs with a valid token do not touch the file.
+
+    Returns the token JSON as saved in the token file.
+    """
+    if token_path.exists():
+        token_json = json.loads(token_path.read_bytes())
+        creds = gmail_api.login(token_json)
+        if creds.token != token_json.get("token"):
+            logger.debug("Credentials refreshed, updating token JSON file")
+            email_address = token_json.get(EMAIL_ADDRESS_KEY)
+            token_json = json.loads(creds.to_json())
+            if email_address is not None:
+                token_json[EMAIL_ADDRESS_KEY] = email_address
+            write_token(token_path, token_json)
+        return token_json
+
+    logger.info("No token JSON file found, logging in with credentials")
+    if not creds_path.exists():
+        logger.error("No credentials JSON file found")
+        sys.exit(1)
+    creds = gmail_api.login(token=None, credentials_path=creds_path)
+    token_json = json.loads(creds.to_json())
+    write_token(token_path, token_json)
+    logger.info("Token JSON file created")
+    return token_json
+
+
+def write_token(token_path: Path, token_json: dict) -> None:
+    """
+    Atomically write the token JSON file.
+
+    token_path: The path to the token JSON file.
+    token_json: The credentials as JSON, with the cached email address if known.
+
+    The token is written to a temporary file that then replaces token_path, so
+    an interrupted write never leaves a truncated token behind.
+    """
+    tmp_path = token_path.with_name(f"{token_path.name}.tmp")
+    tmp_path.write_bytes(json.dumps(token_json).encode())
+    tmp_path.replace(token_path)
+
+
+def get_email_address(gmail_api: "GmailAPI", token_path: Path, token_json: dict) -> str:
+    """
+    Get the logged in account's email address, cached in the token JSON file.
+
+    gmail_api: The logged in GmailAPI object.
+    token_path: The path to the token JSON file.
+    token_json: The token JSON returned by login, updated with the address
+    when it is fetched.
+
+    The address only changes with the account, and logging in with the
+    credentials file writes a fresh token, so repeat runs skip the Gmail call.
+
+    Returns the account's email address.
+    """
+    email_address = token_json.get(EMAIL_ADDRESS_KEY)
+    if email_address is None:
+        email_address = gmail_api.get_current_user()["emailAddress"]
+        token_json[EMAIL_ADDRESS_KEY] = email_address
+        write_token(token_path, token_json)
+    return email_address
+
+
+def main() -> None:
+    """Draft, and optionally schedule, emails to recruiters."""
     args = parse_args()
-    gmail_api = GmailAPI()
+    # Only load .env once the arguments parse, so --help and usage errors
+    # return without importing dotenv
+    load_environment()
 
     # Get values from args or env vars
     subject = get_arg_or_env(
@@ -187,10 +546,34 @@ if __name__ == "__main__":
         )
         sys.exit(1)
 
+    recipients_csv_path = get_arg_or_env(
+        args.recipients_csv,
+        EnvironmentVariables.RECIPIENTS_CSV_PATH,
+    )
+    recipients = get_recipients(args, recipients_csv_path)
+    if not recipients:
+        # Nothing to draft, so skip logging in to Gmail entirely
+        logger.warning("No recipients found in %s", recipients_csv_path)
+        return
+
+    # Imported after argument validation so --help and usage errors return
+    # without loading the Google API client libraries
+    from utils.gmail import GmailAPI  # noqa: PLC0415
+
+    gmail_api = GmailAPI()
+
     should_schedule = get_bool_arg_or_env(
         args.schedule,
         EnvironmentVariables.ENABLE_STREAK_SCHEDULING,
     )
+    send_now = get_bool_arg_or_env(
+        args.send_now,
+        EnvironmentVariables.SEND_NOW,
+    )
+    if send_now and should_schedule:
+        logger.error("send_now cannot be combined with scheduling, which needs drafts")
+        sys.exit(1)
+
     token_path = get_arg_or_env(
         args.token_path,
         EnvironmentVariables.TOKEN_PATH,
@@ -199,58 +582,45 @@ if __name__ == "__main__":
 
     token_path = Path(token_path)
 
-    # Login with token
-    if token_path.exists():
-        with token_path.open("r") as file:
-            token = file.read()
-            token_json = json.loads(token)
-            creds = gmail_api.login(token_json)
-        with token_path.open("w") as file:
-            file.write(creds.to_json())
-    else:
-        logger.info("No token JSON file found, logging in with credentials")
-        # Try logging in with credentials
-        creds_path = get_arg_or_env(
-            args.creds_path,
-            EnvironmentVariables.CREDS_PATH,
-            default="credentials.json",
+    creds_path = get_arg_or_env(
+        args.creds_path,
+        EnvironmentVariables.CREDS_PATH,
+        default="credentials.json",
+    )
+    # Read the template and encode the attachment while logging in, which may
+    # wait on a token refresh round trip
+    with ThreadPoolExecutor() as executor:
+        template_future = executor.submit(Path(message_body_path).read_text)
+        attachment_future = executor.submit(
+            read_attachment_part, attachment_path_string, attachment_name
         )
-        creds_path = Path(creds_path)
-        if not creds_path.exists():
-            logger.error("No credentials JSON file found")
-            sys.exit(1)
-        creds = gmail_api.login(token=None, credentials_path=creds_path)
-        with token_path.open("w") as file:
-            file.write(creds.to_json())
-            logger.info("Token JSON file created")
+        token_json = login(gmail_api, token_path, Path(creds_path))
+        template = template_future.result()
+        attachment = attachment_future.result()
 
     # Setup email contents
-    attachment = (
-        Path(attachment_path_string).read_bytes() if attachment_path_string else None
-    )
-    template = Path(message_body_path).read_text()
-    email_contents = process_string(
+    email_messages = build_email_messages(
+        recipients,
         template,
-        recruiter_name=args.recruiter_name,
-        recruiter_company=args.recruiter_company,
-    )
-    subject = process_string(subject, recruiter_company=args.recruiter_company)
-    email_message = create_email_message(
-        email_contents,
-        args.recruiter_email,
         subject,
         attachment=attachment,
         attachment_name=attachment_name,
     )
-    logger.info(
-        "Recruiter email: %s, Recruiter Name: %s, Recruiter Company: %s",
-        args.recruiter_email,
-        args.recruiter_name,
-        args.recruiter_company,
-    )
 
-    # Save draft
-    draft = gmail_api.save_draft(email_message)
+    if send_now:
+        # A single messages.send call per email, with no intermediate draft,
+        # batching the Gmail requests when sending from a CSV
+        if recipients_csv_path:
+            gmail_api.send_now_batch(email_messages)
+        else:
+            gmail_api.send_now(email_messages[0])
+        return
+
+    # Save drafts, batching the Gmail requests when drafting from a CSV
+    if recipients_csv_path:
+        drafts = gmail_api.save_drafts_batch(email_messages)
+    else:
+        drafts = [gmail_api.save_draft(email_messages[0])]
 
     # Schedule email
     if should_schedule:
@@ -269,11 +639,19 @@ if __name__ == "__main__":
             EnvironmentVariables.SCHEDULE_CSV_PATH,
             required=True,
         )
-        streak_email_address = (
-            get_arg_or_env(
-                args.email_address,
-                EnvironmentVariables.STREAK_EMAIL_ADDRESS,
-            )
-            or gmail_api.get_current_user()["emailAddress"]
+        streak_email_address = get_arg_or_env(
+            args.email_address,
+            EnvironmentVariables.STREAK_EMAIL_ADDRESS,
+        ) or get_email_address(gmail_api, token_path, token_json)
+        schedule_send(
+            timezone,
+            csv_path,
+            drafts,
+            email_messages,
+            streak_token,
+            streak_email_address,
         )
-        schedule_send(timezone, csv_path, draft, streak_token, streak_email_address)
+
+
+if __name__ == "__main__":
+    main()
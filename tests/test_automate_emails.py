@@ -1,14 +1,27 @@
 """Unit tests for the automate_emails.py script."""
 
+import io
 import json
+import logging
+from string import Template
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from automate_emails import (
+    Recipient,
+    build_email_messages,
+    compile_template,
+    configure_logging,
+    create_attachment_part,
     create_email_message,
+    get_email_address,
+    get_recipients,
+    login,
     parse_args,
     process_string,
+    read_attachment_part,
+    read_recipients_csv,
 )
 
 
@@ -41,16 +54,6 @@ def mock_token_file(tmp_path):
     return token_path
 
 
-@pytest.fixture
-def mock_template_file(tmp_path):
-    """Create a mock template file."""
-    template_path = tmp_path / "test_message.txt"
-    template_content = "Hello ${recruiter_name} at ${recruiter_company}"
-    with template_path.open("w") as f:
-        f.write(template_content)
-    return template_path
-
-
 @pytest.fixture
 def mock_attachment_file(tmp_path):
     """Create a mock attachment file."""
@@ -109,6 +112,57 @@ def test_process_string():
     assert result == "Hello Test Recruiter at Test Company"
 
 
+@pytest.mark.parametrize(
+    "template",
+    [
+        "Hello $recruiter_name at ${recruiter_company}",
+        "Costs $$5 at ${recruiter_company}",
+        "Hello ${recruiter_name}, ${recruiter_name}!",
+        "${recruiter_name}",
+        "$recruiter_name$recruiter_company.",
+    ],
+)
+def test_process_string_matches_template(template):
+    """Test the compiled renderer gives the same result as Template.substitute."""
+    kwargs = {"recruiter_name": "A $name", "recruiter_company": "Co"}
+    assert process_string(template, **kwargs) == Template(template).substitute(**kwargs)
+
+
+def test_process_string_invalid_placeholder():
+    """Test that invalid placeholders raise the same error as Template."""
+    with pytest.raises(ValueError, match="Invalid placeholder"):
+        process_string("Costs $5", recruiter_name="Test Recruiter")
+
+
+def test_process_string_without_placeholders():
+    """Test that strings without placeholders are returned unchanged."""
+    s = "Hello there"
+    with patch("automate_emails.compile_renderer") as mock_compile:
+        assert process_string(s, recruiter_company="Co") is s
+    mock_compile.assert_not_called()
+
+
+def test_process_string_missing_key():
+    """Test that unknown placeholders still raise KeyError."""
+    with pytest.raises(KeyError):
+        process_string("Hello ${unknown}", recruiter_name="Test Recruiter")
+
+
+def test_process_string_does_not_substitute_values():
+    """Test placeholders inside values are left alone and non-str values work."""
+    template = "Hi ${recruiter_name} at ${recruiter_company}"
+
+    assert (
+        process_string(
+            template, recruiter_name="${recruiter_company}", recruiter_company="Co"
+        )
+        == "Hi ${recruiter_company} at Co"
+    )
+    assert process_string(template, recruiter_name=1, recruiter_company=2) == (
+        "Hi 1 at 2"
+    )
+
+
 def test_create_email_message_without_attachment():
     """Test creating an email message without an attachment."""
     message = create_email_message(
@@ -121,9 +175,9 @@ def test_create_email_message_without_attachment():
     assert message.get_content().strip() == "Test content"
 
 
-def test_create_email_message_with_attachment(mock_attachment_file):
+def test_create_email_message_with_attachment():
     """Test creating an email message with an attachment."""
-    attachment_content = mock_attachment_file.read_bytes()
+    attachment_content = b"Test attachment content"
     message = create_email_message(
         "Test content",
         "test@example.com",
@@ -135,9 +189,9 @@ def test_create_email_message_with_attachment(mock_attachment_file):
     assert message["Subject"] == "Test Subject"
 
 
-def test_create_email_message_with_attachment_no_name(mock_attachment_file):
+def test_create_email_message_with_attachment_no_name():
     """Test creating an email message with an attachment but no name."""
-    attachment_content = mock_attachment_file.read_bytes()
+    attachment_content = b"Test attachment content"
     message = create_email_message(
         "Test content",
         "test@example.com",
@@ -146,3 +200,253 @@ def test_create_email_message_with_attachment_no_name(mock_attachment_file):
     )
     assert message["To"] == "test@example.com"
     assert message["Subject"] == "Test Subject"
+
+
+def test_compile_template_is_cached():
+    """Test that compiling the same template string reuses the Template."""
+    template = "Hello ${recruiter_name}"
+    assert compile_template(template) is compile_template(template)
+
+
+def test_parse_args_send_now():
+    """Test the send now flag defaults to None so the env var can apply."""
+    with patch("sys.argv", ["automate_emails.py", "Company", "Name", "a@b.com"]):
+        assert parse_args().send_now is None
+    with patch("sys.argv", ["automate_emails.py", "--send_now", "Company", "Name"]):
+        assert parse_args().send_now is True
+
+
+def test_parse_args_recipients_csv():
+    """Test that recruiter arguments are optional when a recipients CSV is given."""
+    with patch(
+        "sys.argv",
+        ["automate_emails.py", "--recipients_csv", "recipients.csv"],
+    ):
+        args = parse_args()
+        assert args.recipients_csv == "recipients.csv"
+        assert args.recruiter_company is None
+        assert args.recruiter_name is None
+        assert args.recruiter_email is None
+
+
+def test_read_recipients_csv(tmp_path):
+    """Test reading recruiters from a CSV file."""
+    csv_path = tmp_path / "recipients.csv"
+    csv_path.write_text(
+        "RECRUITER_NAME,RECRUITER_EMAIL,RECRUITER_COMPANY\n"
+        "Alice, alice@example.com, Company A\n"
+        "Bob,bob@example.com,Company B\n"
+    )
+
+    assert read_recipients_csv(csv_path) == [
+        Recipient("Company A", "Alice", "alice@example.com"),
+        Recipient("Company B", "Bob", "bob@example.com"),
+    ]
+
+
+def test_read_recipients_csv_skips_blank_and_incomplete_rows(tmp_path):
+    """Test blank lines and rows missing columns do not stop the read."""
+    csv_path = tmp_path / "recipients.csv"
+    csv_path.write_text(
+        "RECRUITER_NAME,RECRUITER_EMAIL,RECRUITER_COMPANY\n"
+        "Alice,alice@example.com,Company A\n"
+        "\n"
+        "Bob,bob@example.com\n"
+        "Carol,carol@example.com,Company C\n"
+        "\n"
+    )
+
+    assert read_recipients_csv(csv_path) == [
+        Recipient("Company A", "Alice", "alice@example.com"),
+        Recipient("Company C", "Carol", "carol@example.com"),
+    ]
+
+
+def test_read_recipients_csv_missing_column(tmp_path):
+    """Test a header without a required column exits instead of raising."""
+    csv_path = tmp_path / "recipients.csv"
+    csv_path.write_text("RECRUITER_NAME,RECRUITER_EMAIL\nAlice,alice@example.com\n")
+
+    with pytest.raises(SystemExit):
+        read_recipients_csv(csv_path)
+
+
+def test_get_recipients(tmp_path, mock_args):
+    """Test recipients come from the CSV or the arguments, but never both."""
+    csv_path = tmp_path / "recipients.csv"
+    csv_path.write_text("RECRUITER_NAME,RECRUITER_EMAIL,RECRUITER_COMPANY\n")
+    mock_args.recipients_csv = None
+
+    assert get_recipients(mock_args, None) == [
+        Recipient("Test Company", "Test Recruiter", "test@example.com"),
+    ]
+
+    mock_args.recipients_csv = str(csv_path)
+    with pytest.raises(SystemExit):
+        get_recipients(mock_args, str(csv_path))
+
+    mock_args.recruiter_company = None
+    mock_args.recruiter_name = None
+    mock_args.recruiter_email = None
+    assert get_recipients(mock_args, str(csv_path)) == []
+    with pytest.raises(SystemExit):
+        get_recipients(mock_args, None)
+
+
+def test_get_recipients_arguments_override_csv_from_env(tmp_path, mock_args):
+    """Test the recruiter arguments win over RECIPIENTS_CSV_PATH from the env."""
+    csv_path = tmp_path / "recipients.csv"
+    csv_path.write_text("RECRUITER_NAME,RECRUITER_EMAIL,RECRUITER_COMPANY\n")
+    mock_args.recipients_csv = None
+
+    assert get_recipients(mock_args, str(csv_path)) == [
+        Recipient("Test Company", "Test Recruiter", "test@example.com"),
+    ]
+
+    mock_args.recruiter_email = None
+    with pytest.raises(SystemExit):
+        get_recipients(mock_args, str(csv_path))
+
+
+def test_create_email_message_with_attachment_part():
+    """Test attaching a part streamed from the attachment file."""
+    attachment_content = bytes(range(256)) * 1000
+
+    part = create_attachment_part(io.BytesIO(attachment_content), "Resume.pdf")
+    message = create_email_message(
+        "Test content",
+        "test@example.com",
+        "Test Subject",
+        attachment=part,
+    )
+
+    attachments = list(message.iter_attachments())
+    assert len(attachments) == 1
+    assert attachments[0].get_filename() == "Resume.pdf"
+    assert attachments[0].get_content() == attachment_content
+    assert message.get_body().get_content().strip() == "Test content"
+
+
+def test_login_keeps_token_file_when_unchanged(mock_token_file):
+    """Test that a still valid token does not rewrite the token file."""
+    gmail_api = MagicMock()
+    gmail_api.login.return_value.token = "test_token"  # noqa: S105
+    before = mock_token_file.stat().st_mtime_ns
+
+    token_json = login(
+        gmail_api, mock_token_file, mock_token_file.parent / "credentials.json"
+    )
+
+    assert token_json == {"token": "test_token"}
+    gmail_api.login.assert_called_once_with({"token": "test_token"})
+    gmail_api.login.return_value.to_json.assert_not_called()
+    assert mock_token_file.stat().st_mtime_ns == before
+
+
+def test_login_rewrites_refreshed_token(mock_token_file):
+    """Test that refreshed credentials are written back to the token file."""
+    gmail_api = MagicMock()
+    gmail_api.login.return_value.token = "refreshed_token"  # noqa: S105
+    gmail_api.login.return_value.to_json.return_value = '{"token": "refreshed"}'
+
+    token_json = login(
+        gmail_api, mock_token_file, mock_token_file.parent / "credentials.json"
+    )
+
+    assert token_json == json.loads(mock_token_file.read_text())
+    assert token_json == {"token": "refreshed"}
+    assert list(mock_token_file.parent.iterdir()) == [mock_token_file]
+
+
+def test_get_email_address_is_cached_in_token_file(mock_token_file):
+    """Test that the account's email address is only fetched once."""
+    gmail_api = MagicMock()
+    gmail_api.get_current_user.return_value = {"emailAddress": "me@example.com"}
+    token_json = {"token": "test_token"}
+
+    first = get_email_address(gmail_api, mock_token_file, token_json)
+    second = get_email_address(gmail_api, mock_token_file, token_json)
+
+    assert first == second == "me@example.com"
+    gmail_api.get_current_user.assert_called_once_with()
+    assert json.loads(mock_token_file.read_text()) == token_json
+    assert token_json == {"token": "test_token", "email_address": "me@example.com"}
+
+
+def test_login_keeps_cached_email_address_on_refresh(mock_token_file):
+    """Test that refreshing the token keeps the cached email address."""
+    mock_token_file.write_text(
+        json.dumps({"token": "test_token", "email_address": "me@example.com"})
+    )
+    gmail_api = MagicMock()
+    gmail_api.login.return_value.token = "refreshed_token"  # noqa: S105
+    gmail_api.login.return_value.to_json.return_value = '{"token": "refreshed"}'
+
+    login(gmail_api, mock_token_file, mock_token_file.parent / "credentials.json")
+
+    assert json.loads(mock_token_file.read_text()) == {
+        "token": "refreshed",
+        "email_address": "me@example.com",
+    }
+
+
+def test_build_email_messages():
+    """Test building a message for every recipient from shared templates."""
+    recipients = [
+        Recipient("Company A", "Alice", "alice@example.com"),
+        Recipient("Company B", "Bob", "bob@example.com"),
+    ]
+
+    messages = build_email_messages(
+        recipients,
+        "Hello ${recruiter_name} at ${recruiter_company}",
+        "Working at ${recruiter_company}",
+    )
+
+    assert [m["To"] for m in messages] == ["alice@example.com", "bob@example.com"]
+    assert [m["Subject"] for m in messages] == [
+        "Working at Company A",
+        "Working at Company B",
+    ]
+    assert messages[1].get_content().strip() == "Hello Bob at Company B"
+
+
+def test_build_email_messages_shares_attachment_part():
+    """Test that the encoded attachment part is reused, not re-encoded."""
+    part = create_attachment_part(
+        io.BytesIO(b"Test attachment content"), "Test Attachment"
+    )
+    recipients = [
+        Recipient("Company A", "Alice", "alice@example.com"),
+        Recipient("Company B", "Bob", "bob@example.com"),
+    ]
+
+    messages = build_email_messages(recipients, "Hi", "Hello", attachment=part)
+
+    for message in messages:
+        assert list(message.iter_attachments()) == [part]
+        assert next(message.iter_attachments()) is part
+
+
+def test_read_attachment_part(mock_attachment_file):
+    """Test reading the attachment file into a part, or None without a path."""
+    part = read_attachment_part(str(mock_attachment_file), "Test Attachment")
+
+    assert part.get_filename() == "Test Attachment"
+    assert part.get_content() == b"Test attachment content"
+    assert read_attachment_part(None, None) is None
+
+
+def test_configure_logging_adds_one_handler():
+    """Test that configuring logging twice does not duplicate log lines."""
+    root_logger = logging.getLogger()
+    handlers, level = list(root_logger.handlers), root_logger.level
+    try:
+        configure_logging()
+        configure_logging()
+        added = [h for h in root_logger.handlers if h not in handlers]
+    finally:
+        root_logger.handlers[:] = handlers
+        root_logger.setLevel(level)
+
+    assert len(added) == 1
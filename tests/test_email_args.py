@@ -1,134 +1,143 @@
 """Unit tests for email argument parsing utilities."""
 
-import os
-from unittest.mock import patch
+import argparse
+import re
 
 import pytest
 
 from utils.email_args import (
     EnvironmentVariables,
+    add_common_email_args,
+    add_initial_email_args,
     get_arg_or_env,
     get_bool_arg_or_env,
 )
 
+# Bound once so the tests do not repeat the enum attribute lookups
+EMAIL_SUBJECT = EnvironmentVariables.EMAIL_SUBJECT
+ENABLE_STREAK_SCHEDULING = EnvironmentVariables.ENABLE_STREAK_SCHEDULING
+MISSING_EMAIL_SUBJECT = re.compile(
+    re.escape(
+        f"Missing required argument or environment variable: {EMAIL_SUBJECT.value}"
+    )
+)
+
+
+def set_env(
+    monkeypatch: pytest.MonkeyPatch, env_var: EnvironmentVariables, value: str | None
+) -> None:
+    """Set env_var to value for the test, or make sure it is unset for None."""
+    if value is None:
+        monkeypatch.delenv(env_var.value, raising=False)
+    else:
+        monkeypatch.setenv(env_var.value, value)
+
+
+@pytest.mark.parametrize(
+    ("arg_value", "env_value", "default", "expected"),
+    [
+        ("test_value", None, None, "test_value"),
+        ("test_value", "env_value", None, "test_value"),
+        (None, "test_value", None, "test_value"),
+        (None, None, "default_value", "default_value"),
+        (None, None, None, None),
+    ],
+)
+def test_get_arg_or_env(monkeypatch, arg_value, env_value, default, expected):
+    """Test the argument takes precedence over the env var, then the default."""
+    set_env(monkeypatch, EMAIL_SUBJECT, env_value)
+    value = get_arg_or_env(arg_value, EMAIL_SUBJECT, default=default)
+    assert value == expected
 
-@pytest.fixture
-def mock_env_vars():
-    """Set up mock environment variables for testing."""
-    env_vars = {
-        EnvironmentVariables.EMAIL_SUBJECT.value: "env_subject",
-        EnvironmentVariables.MESSAGE_BODY_PATH.value: "env_body.txt",
-        EnvironmentVariables.TIMEZONE.value: "env_tz",
-        EnvironmentVariables.STREAK_TOKEN.value: "env_token",
-        EnvironmentVariables.STREAK_EMAIL_ADDRESS.value: "env_email@example.com",
-        EnvironmentVariables.SCHEDULE_CSV_PATH.value: "env_schedule.csv",
-        EnvironmentVariables.ENABLE_STREAK_SCHEDULING.value: "true",
-        EnvironmentVariables.ATTACHMENT_PATH.value: "env_attachment.pdf",
-        EnvironmentVariables.ATTACHMENT_NAME.value: "env_attachment_name.pdf",
-    }
-    with patch.dict(os.environ, env_vars):
-        yield env_vars
-
-
-def test_get_arg_or_env_with_arg():
-    """Test getting value from argument."""
-    value = get_arg_or_env("test_value", EnvironmentVariables.EMAIL_SUBJECT)
-    assert value == "test_value"
-
-
-def test_get_arg_or_env_with_env():
-    """Test getting value from environment variable."""
-    with patch.dict(
-        os.environ, {EnvironmentVariables.EMAIL_SUBJECT.value: "test_value"}
-    ):
-        value = get_arg_or_env(None, EnvironmentVariables.EMAIL_SUBJECT)
-        assert value == "test_value"
-
-
-def test_get_arg_or_env_with_default():
-    """Test default value when neither argument nor environment variable is set."""
-    with patch.dict(os.environ, {}, clear=True):
-        value = get_arg_or_env(
-            None, EnvironmentVariables.EMAIL_SUBJECT, default="default_value"
-        )
-        assert value == "default_value"
-
-
-def test_get_arg_or_env_required_missing():
+
+def test_get_arg_or_env_required_missing(monkeypatch):
     """Test value when required but neither argument nor environment variable is set."""
-    with patch.dict(os.environ, {}, clear=True):  # noqa: SIM117
-        with pytest.raises(
-            ValueError,
-            match=f"Missing required argument or environment variable: {EnvironmentVariables.EMAIL_SUBJECT.value}",  # noqa: E501
-        ):
-            get_arg_or_env(None, EnvironmentVariables.EMAIL_SUBJECT, required=True)
-
-
-def test_get_bool_arg_or_env_true():
-    """Test getting boolean value when true."""
-    with patch("argparse.Namespace") as mock_args:
-        mock_args.test_arg = True
-        value = get_bool_arg_or_env(
-            mock_args.test_arg, EnvironmentVariables.ENABLE_STREAK_SCHEDULING
-        )
-        assert value is True
-
-
-def test_get_bool_arg_or_env_false():
-    """Test getting boolean value when false."""
-    with patch("argparse.Namespace") as mock_args:
-        mock_args.test_arg = False
-        value = get_bool_arg_or_env(
-            mock_args.test_arg, EnvironmentVariables.ENABLE_STREAK_SCHEDULING
-        )
-        assert value is False
-
-
-def test_get_bool_arg_or_env_env_true():
-    """Test getting boolean value from environment variable when true."""
-    with patch("argparse.Namespace") as mock_args:
-        mock_args.test_arg = None
-        with patch.dict(
-            os.environ, {EnvironmentVariables.ENABLE_STREAK_SCHEDULING.value: "true"}
-        ):
-            value = get_bool_arg_or_env(
-                mock_args.test_arg, EnvironmentVariables.ENABLE_STREAK_SCHEDULING
-            )
-            assert value is True
-
-
-def test_get_bool_arg_or_env_env_false():
-    """Test getting boolean value from environment variable when false."""
-    with patch("argparse.Namespace") as mock_args:
-        mock_args.test_arg = None
-        with patch.dict(
-            os.environ, {EnvironmentVariables.ENABLE_STREAK_SCHEDULING.value: "false"}
-        ):
-            value = get_bool_arg_or_env(
-                mock_args.test_arg, EnvironmentVariables.ENABLE_STREAK_SCHEDULING
-            )
-            assert value is False
-
-
-def test_get_bool_arg_or_env_invalid():
-    """Test getting boolean value with invalid value."""
-    with patch("argparse.Namespace") as mock_args:
-        mock_args.test_arg = None
-        with patch.dict(
-            os.environ, {EnvironmentVariables.ENABLE_STREAK_SCHEDULING.value: "invalid"}
-        ):
-            value = get_bool_arg_or_env(
-                mock_args.test_arg, EnvironmentVariables.ENABLE_STREAK_SCHEDULING
-            )
-            assert value is False
-
-
-def test_get_bool_arg_or_env_missing():
-    """Test get boolean value when neither argument nor environment variable is set."""
-    with patch("argparse.Namespace") as mock_args:
-        mock_args.test_arg = None
-        with patch.dict(os.environ, {}, clear=True):
-            value = get_bool_arg_or_env(
-                mock_args.test_arg, EnvironmentVariables.ENABLE_STREAK_SCHEDULING
-            )
-            assert value is False
+    monkeypatch.delenv(EMAIL_SUBJECT.value, raising=False)
+    with pytest.raises(ValueError, match=MISSING_EMAIL_SUBJECT):
+        get_arg_or_env(None, EMAIL_SUBJECT, required=True)
+
+
+@pytest.mark.parametrize(
+    ("arg_value", "env_value", "expected"),
+    [
+        (True, None, True),
+        (False, None, False),
+        (True, "false", True),
+        (False, "true", False),
+        (None, None, False),
+    ],
+)
+def test_get_bool_arg_or_env(monkeypatch, arg_value, env_value, expected):
+    """Test getting a boolean from the argument, else the env var, else False."""
+    set_env(monkeypatch, ENABLE_STREAK_SCHEDULING, env_value)
+    value = get_bool_arg_or_env(arg_value, ENABLE_STREAK_SCHEDULING)
+    assert value is expected
+
+
+@pytest.mark.parametrize(
+    ("env_value", "expected"),
+    [
+        ("true", True),
+        ("True", True),
+        (" TRUE ", True),
+        ("1", True),
+        ("t", True),
+        ("y", True),
+        ("yes", True),
+        ("false", False),
+        ("False", False),
+        ("0", False),
+        ("f", False),
+        ("n", False),
+        ("no", False),
+        ("", False),
+        ("invalid", False),
+    ],
+)
+def test_get_bool_arg_or_env_from_env(monkeypatch, env_value, expected):
+    """Test the env var is parsed with the str_to_bool truthiness grammar."""
+    monkeypatch.setenv(ENABLE_STREAK_SCHEDULING.value, env_value)
+    assert get_bool_arg_or_env(None, ENABLE_STREAK_SCHEDULING) is expected
+
+
+@pytest.mark.parametrize(
+    ("add_args", "expected_options"),
+    [
+        (
+            add_common_email_args,
+            {
+                "subject": ["-s", "--subject"],
+                "message_body_path": ["-m", "--message_body_path"],
+                "timezone": ["-tz", "--timezone"],
+                "schedule": ["-sch", "--schedule"],
+                "send_now": ["-now", "--send_now"],
+                "schedule_csv_path": ["-scsv", "--schedule_csv_path"],
+                "email_address": ["-e", "--email_address"],
+                "token_path": ["-t", "--token_path"],
+                "creds_path": ["-c", "--creds_path"],
+            },
+        ),
+        (
+            add_initial_email_args,
+            {
+                "recruiter_company": [],
+                "recruiter_name": [],
+                "recruiter_email": [],
+                "recipients_csv": ["-rcsv", "--recipients_csv"],
+                "attachment_path": ["-ap", "--attachment_path"],
+                "attachment_name": ["-an", "--attachment_name"],
+            },
+        ),
+    ],
+)
+def test_add_email_args(add_args, expected_options):
+    """Test the arguments are optional and default to None so env vars apply."""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_args(parser)
+    actions = {action.dest: action for action in parser._actions}  # noqa: SLF001
+
+    options = {dest: action.option_strings for dest, action in actions.items()}
+    assert options == expected_options
+    for action in actions.values():
+        assert action.required is False
+        assert action.default is None
@@ -7,7 +7,7 @@ import pytest
 from google.oauth2.credentials import Credentials
 from googleapiclient.errors import HttpError
 
-from utils.gmail import GmailAPI
+from utils.gmail import MAX_BACKOFF_SECONDS, GmailAPI
 
 
 @pytest.fixture
@@ -36,6 +36,35 @@ def mock_email_message():
     return message
 
 
+@pytest.fixture
+def batch_service(gmail_api):
+    """
+    Fixture to mock Gmail batch requests.
+
+    Returns a function taking, for each batch in turn, the (request_id,
+    response, exception) callback arguments its execute replays. That function
+    returns the list of batches created so far.
+    """
+    mock_service = MagicMock()
+    gmail_api.service = mock_service
+    batches = []
+
+    def replay(*callbacks_per_batch):
+        callbacks_iter = iter(callbacks_per_batch)
+
+        def new_batch(callback):
+            batch = MagicMock()
+            callbacks = next(callbacks_iter)
+            batch.execute.side_effect = lambda: [callback(*c) for c in callbacks]
+            batches.append(batch)
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+        return batches
+
+    return replay
+
+
 def test_login_with_valid_token(gmail_api, mock_credentials):
     """Test login with valid token."""
     with patch("utils.gmail.Credentials.from_authorized_user_info") as mock_from_auth:
@@ -88,7 +117,11 @@ def test_save_draft_success(gmail_api, mock_email_message):
     result = gmail_api.save_draft(mock_email_message)
 
     assert result == mock_draft
-    mock_service.users.return_value.drafts.return_value.create.assert_called_once()
+    mock_create = mock_service.users.return_value.drafts.return_value.create
+    mock_create.assert_called_once()
+    media = mock_create.call_args.kwargs["media_body"]
+    assert media.mimetype() == "message/rfc822"
+    assert media.getbytes(0, media.size()) == mock_email_message.as_bytes()
 
 
 def test_save_draft_failure(gmail_api, mock_email_message):
@@ -104,6 +137,59 @@ def test_save_draft_failure(gmail_api, mock_email_message):
     assert result is False
 
 
+def test_save_draft_retries_only_rate_limits(gmail_api, mock_email_message):
+    """Test a rate limited draft is retried but a server error is not repeated."""
+    mock_service = MagicMock()
+    execute = (
+        mock_service.users.return_value.drafts.return_value.create.return_value.execute
+    )
+    execute.side_effect = [
+        HttpError(resp=MagicMock(status=429), content=b"Rate limited"),
+        HttpError(resp=MagicMock(status=500), content=b"Server error"),
+    ]
+    gmail_api.service = mock_service
+
+    with patch("utils.gmail.time.sleep") as mock_sleep:
+        result = gmail_api.save_draft(mock_email_message)
+
+    assert result is False
+    assert execute.call_count == 2  # noqa: PLR2004 one retry after the rate limit
+    mock_sleep.assert_called_once_with(1)
+
+
+def test_save_draft_caps_retry_after(gmail_api, mock_email_message):
+    """Test that a long Retry-After is capped at MAX_BACKOFF_SECONDS."""
+    mock_service = MagicMock()
+    execute = (
+        mock_service.users.return_value.drafts.return_value.create.return_value.execute
+    )
+    rate_limited = MagicMock(status=429)
+    rate_limited.get.return_value = "3600"
+    execute.side_effect = [
+        HttpError(resp=rate_limited, content=b"Rate limited"),
+        HttpError(resp=MagicMock(status=500), content=b"Server error"),
+    ]
+    gmail_api.service = mock_service
+
+    with patch("utils.gmail.time.sleep") as mock_sleep:
+        gmail_api.save_draft(mock_email_message)
+
+    mock_sleep.assert_called_once_with(MAX_BACKOFF_SECONDS)
+
+
+def test_send_now_does_not_retry_server_errors(gmail_api, mock_email_message):
+    """Test a send that may have gone through is never sent twice."""
+    mock_service = MagicMock()
+    execute = (
+        mock_service.users.return_value.messages.return_value.send.return_value.execute
+    )
+    execute.side_effect = HttpError(resp=MagicMock(status=500), content=b"Error")
+    gmail_api.service = mock_service
+
+    assert gmail_api.send_now(mock_email_message) is False
+    execute.assert_called_once_with()
+
+
 def test_send_now_success(gmail_api, mock_email_message):
     """Test successful message sending."""
     mock_service = MagicMock()
@@ -114,7 +200,11 @@ def test_send_now_success(gmail_api, mock_email_message):
     result = gmail_api.send_now(mock_email_message)
 
     assert result == mock_sent
-    mock_service.users.return_value.messages.return_value.send.assert_called_once()
+    send = mock_service.users.return_value.messages.return_value.send
+    send.assert_called_once()
+    media = send.call_args.kwargs["media_body"]
+    assert media.mimetype() == "message/rfc822"
+    assert media.getbytes(0, media.size()) == mock_email_message.as_bytes()
 
 
 def test_send_now_failure(gmail_api, mock_email_message):
@@ -143,3 +233,71 @@ def test_get_current_user(gmail_api):
 
     assert result == mock_user_info
     mock_service.users.return_value.getProfile.assert_called_once_with(userId="me")
+
+
+def test_save_drafts_batch_success(gmail_api, batch_service, mock_email_message):
+    """Test saving several drafts with batch requests."""
+    batches = batch_service(
+        [("0", {"id": "0"}, None), ("1", {"id": "1"}, None)],
+        [("2", {"id": "2"}, None)],
+    )
+
+    with patch("utils.gmail.time.sleep") as mock_sleep:
+        result = gmail_api.save_drafts_batch([mock_email_message] * 3, batch_size=2)
+
+    assert result == [{"id": "0"}, {"id": "1"}, {"id": "2"}]
+    assert len(batches) == 2  # noqa: PLR2004 3 drafts in batches of 2
+    assert batches[0].add.call_count == 2  # noqa: PLR2004 first batch is full
+    assert batches[1].add.call_count == 1
+    mock_sleep.assert_called_once()
+
+
+def test_save_drafts_batch_partial_failure(
+    gmail_api, batch_service, mock_email_message
+):
+    """Test that a failed request in a batch only fails that draft."""
+    batch_service(
+        [
+            ("0", {"id": "draft0"}, None),
+            ("1", None, HttpError(resp=MagicMock(), content=b"Error")),
+        ]
+    )
+
+    result = gmail_api.save_drafts_batch([mock_email_message] * 2)
+
+    assert result == [{"id": "draft0"}, False]
+
+
+def test_save_drafts_batch_retries_rate_limited(
+    gmail_api, batch_service, mock_email_message
+):
+    """Test that rate limited drafts are retried in a later batch."""
+    rate_limited = HttpError(resp=MagicMock(status=429), content=b"Rate limited")
+    batch_service(
+        [("0", {"id": "draft0"}, None), ("1", None, rate_limited)],
+        [("1", {"id": "draft1"}, None)],
+    )
+
+    with patch("utils.gmail.time.sleep") as mock_sleep:
+        result = gmail_api.save_drafts_batch([mock_email_message] * 2)
+
+    assert result == [{"id": "draft0"}, {"id": "draft1"}]
+    mock_sleep.assert_called_once_with(1)
+
+
+def test_send_now_batch(gmail_api, batch_service, mock_email_message):
+    """Test sending several messages with batch requests."""
+    batch_service(
+        [
+            ("0", {"id": "message0"}, None),
+            ("1", None, HttpError(resp=MagicMock(), content=b"Error")),
+        ]
+    )
+
+    result = gmail_api.send_now_batch([mock_email_message] * 2)
+
+    assert result == [{"id": "message0"}, False]
+    mock_service = gmail_api.service
+    send = mock_service.users.return_value.messages.return_value.send
+    assert send.call_count == 2  # noqa: PLR2004 one send request per message
+    mock_service.users.return_value.drafts.return_value.create.assert_not_called()
@@ -1,11 +1,17 @@
 import csv
 import datetime
+import os
 from io import StringIO
 from zoneinfo import ZoneInfo
 
 import pytest
 
-from utils.schedule_helper import get_scheduled_send_time, parse_time_ranges_csv
+from utils.schedule_helper import (
+    get_scheduled_send_time,
+    load_time_ranges_csv,
+    parse_time,
+    parse_time_ranges_csv,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -34,7 +40,8 @@ def test_parse_time_ranges_csv():
 0,13:00,15:00
 1,10:00,14:00
 """
-    csv_reader = csv.DictReader(StringIO(csv_data))
+    csv_reader = csv.reader(StringIO(csv_data))
+    next(csv_reader)
     result = parse_time_ranges_csv(csv_reader)
 
     assert len(result) == 7  # noqa: PLR2004 7 days in a week
@@ -47,9 +54,62 @@ def test_parse_time_ranges_csv():
     assert result[6] == []
 
 
+def test_load_time_ranges_csv_skips_blank_lines(tmp_path):
+    """Test blank lines in the schedule CSV are ignored."""
+    csv_path = tmp_path / "scheduler.csv"
+    csv_path.write_text("DAY,START_TIME,END_TIME\n0,09:00,12:00\n\n1,10:00,14:00\n\n")
+
+    result = load_time_ranges_csv(csv_path)
+
+    assert result[0] == ((datetime.time(9, 0), datetime.time(12, 0)),)
+    assert result[1] == ((datetime.time(10, 0), datetime.time(14, 0)),)
+
+
+def test_load_time_ranges_csv_finds_columns_by_name(tmp_path):
+    """Test the schedule columns are matched by header name, not position."""
+    csv_path = tmp_path / "scheduler.csv"
+    csv_path.write_text("START_TIME, END_TIME, DAY\n09:00,12:00,2\n")
+
+    result = load_time_ranges_csv(csv_path)
+
+    assert result[2] == ((datetime.time(9, 0), datetime.time(12, 0)),)
+
+
+def test_load_time_ranges_csv_missing_column(tmp_path):
+    """Test a header without one of the schedule columns is rejected."""
+    csv_path = tmp_path / "scheduler.csv"
+    csv_path.write_text("DAY,START,END\n0,09:00,12:00\n")
+
+    with pytest.raises(ValueError, match="START_TIME, END_TIME"):
+        load_time_ranges_csv(csv_path)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("10:00", datetime.time(10, 0)),
+        (" 14:30 ", datetime.time(14, 30)),
+        ("9:05", datetime.time(9, 5)),
+    ],
+)
+def test_parse_time(value, expected):
+    """Test times are parsed with or without padding and surrounding spaces."""
+    assert parse_time(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value", ["09:00Z", "09:00+02:00", "0900", "09", "09:00:30", "25:00", "9:5"]
+)
+def test_parse_time_rejects_other_formats(value):
+    """Test only H:MM and HH:MM times without an offset are accepted."""
+    with pytest.raises(ValueError, match=r"HH:MM|must be in"):
+        parse_time(value)
+
+
 def test_get_scheduled_send_time_within_range(csv_data):
     """Correctly schedules an email within an allowed time range."""
-    csv_reader = csv.DictReader(StringIO(csv_data))
+    csv_reader = csv.reader(StringIO(csv_data))
+    next(csv_reader)
     parsed_csv = parse_time_ranges_csv(csv_reader)
     dates = [
         (
@@ -92,3 +152,20 @@ def test_get_scheduled_send_time_within_range(csv_data):
             assert result is expected
         else:
             assert expected[0] <= result < expected[1]
+
+
+def test_load_time_ranges_csv_reparses_after_change(tmp_path):
+    """Test that cached ranges are reused until the CSV file changes."""
+    csv_path = tmp_path / "scheduler.csv"
+    csv_path.write_text("DAY,START_TIME,END_TIME\n0,09:00,12:00\n")
+
+    first = load_time_ranges_csv(csv_path)
+    assert load_time_ranges_csv(csv_path) is first
+    assert first[0] == ((datetime.time(9, 0), datetime.time(12, 0)),)
+
+    csv_path.write_text("DAY,START_TIME,END_TIME\n1,10:00,14:00\n")
+    os.utime(csv_path, ns=(0, csv_path.stat().st_mtime_ns + 1))
+
+    second = load_time_ranges_csv(csv_path)
+    assert second[0] == ()
+    assert second[1] == ((datetime.time(10, 0), datetime.time(14, 0)),)
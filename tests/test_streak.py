@@ -1,12 +1,19 @@
 """Unit tests for the streak module."""
 
 import datetime
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
-from utils.streak import StreakSendLaterConfig, schedule_send_later
+from utils.streak import (
+    MAX_BACKOFF_SECONDS,
+    MAX_RETRIES,
+    StreakSendLaterConfig,
+    schedule_send_later,
+    schedule_send_later_many,
+)
 
 
 @pytest.fixture
@@ -124,3 +131,73 @@ def test_schedule_send_later_network_error(mock_config):
     with patch("requests.post", side_effect=requests.RequestException("Network error")):
         result = schedule_send_later(mock_config)
         assert result is False
+
+
+def test_schedule_send_later_retries_rate_limited(mock_config):
+    """Test that rate limited requests are retried with backoff."""
+    rate_limited = MagicMock(ok=False, status_code=429, headers={"Retry-After": "2"})
+    success = MagicMock(ok=True, status_code=200)
+
+    with (
+        patch("requests.post", side_effect=[rate_limited, success]) as mock_post,
+        patch("utils.streak.time.sleep") as mock_sleep,
+    ):
+        result = schedule_send_later(mock_config)
+
+    assert result is True
+    assert mock_post.call_count == 2  # noqa: PLR2004 one retry
+    mock_sleep.assert_called_once_with(2)
+
+
+def test_schedule_send_later_caps_retry_after(mock_config):
+    """Test that a long Retry-After is capped at MAX_BACKOFF_SECONDS."""
+    rate_limited = MagicMock(ok=False, status_code=429, headers={"Retry-After": "3600"})
+    success = MagicMock(ok=True, status_code=200)
+
+    with (
+        patch("requests.post", side_effect=[rate_limited, success]),
+        patch("utils.streak.time.sleep") as mock_sleep,
+    ):
+        assert schedule_send_later(mock_config) is True
+
+    mock_sleep.assert_called_once_with(MAX_BACKOFF_SECONDS)
+
+
+def test_schedule_send_later_gives_up_after_retries(mock_config):
+    """Test that scheduling fails once the retries are exhausted."""
+    rate_limited = MagicMock(ok=False, status_code=429, headers={})
+
+    with (
+        patch("requests.post", return_value=rate_limited) as mock_post,
+        patch("utils.streak.time.sleep") as mock_sleep,
+    ):
+        result = schedule_send_later(mock_config)
+
+    assert result is False
+    assert mock_post.call_count == MAX_RETRIES + 1
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 4]
+
+
+def test_schedule_send_later_many(mock_config):
+    """Test scheduling several emails keeps the order of the results."""
+    configs = [mock_config, mock_config._replace(draft_id="failing_draft")]
+
+    session_threads = {}
+
+    def post(session, *_args, **kwargs):
+        session_threads.setdefault(id(session), set()).add(threading.get_ident())
+        return MagicMock(ok=kwargs["data"]["draftId"] != "failing_draft")
+
+    with (
+        patch("requests.post") as mock_post,
+        patch(
+            "requests.Session.post", autospec=True, side_effect=post
+        ) as mock_session_post,
+    ):
+        result = schedule_send_later_many(configs * 4)
+
+    assert result == [True, False] * 4
+    assert mock_session_post.call_count == len(configs) * 4
+    mock_post.assert_not_called()
+    # No session is shared between worker threads
+    assert all(len(threads) == 1 for threads in session_threads.values())
@@ -4,12 +4,8 @@ import argparse
 import os
 from enum import Enum
 
-from dotenv import load_dotenv
-
 from utils.funcs import str_to_bool
 
-load_dotenv()
-
 
 class EnvironmentVariables(Enum):
     """Environment variables used across email automation scripts."""
@@ -22,12 +18,14 @@ class EnvironmentVariables(Enum):
     STREAK_EMAIL_ADDRESS = "STREAK_EMAIL_ADDRESS"
     SCHEDULE_CSV_PATH = "SCHEDULE_CSV_PATH"
     ENABLE_STREAK_SCHEDULING = "ENABLE_STREAK_SCHEDULING"
+    SEND_NOW = "SEND_NOW"
     TOKEN_PATH = "TOKEN_PATH"  # noqa: S105
     CREDS_PATH = "CREDS_PATH"
 
     # Initial email specific variables
     ATTACHMENT_PATH = "ATTACHMENT_PATH"
     ATTACHMENT_NAME = "ATTACHMENT_NAME"
+    RECIPIENTS_CSV_PATH = "RECIPIENTS_CSV_PATH"
 
 
 def get_arg_or_env(
@@ -132,6 +130,15 @@ def add_common_email_args(parser: argparse.ArgumentParser) -> None:
         action="store_const",
         const=True,
     )
+    parser.add_argument(
+        "-now",
+        "--send_now",
+        help=f"Send the emails immediately instead of saving drafts. Overrides the \
+            {EnvironmentVariables.SEND_NOW.value} environment variable. \
+            Cannot be combined with --schedule, which needs drafts",
+        action="store_const",
+        const=True,
+    )
     parser.add_argument(
         "-scsv",
         "--schedule_csv_path",
@@ -174,13 +181,30 @@ def add_common_email_args(parser: argparse.ArgumentParser) -> None:
 def add_initial_email_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments specific to initial email sending."""
     parser.add_argument(
-        "recruiter_company", type=str, help="The company name of the recruiter"
+        "recruiter_company",
+        type=str,
+        help="The company name of the recruiter",
+        nargs="?",
+    )
+    parser.add_argument(
+        "recruiter_name", type=str, help="The full name of the recruiter", nargs="?"
     )
     parser.add_argument(
-        "recruiter_name", type=str, help="The full name of the recruiter"
+        "recruiter_email",
+        type=str,
+        help="The email address of the recruiter",
+        nargs="?",
     )
     parser.add_argument(
-        "recruiter_email", type=str, help="The email address of the recruiter"
+        "-rcsv",
+        "--recipients_csv",
+        type=str,
+        help=f"CSV with RECRUITER_COMPANY, RECRUITER_NAME and RECRUITER_EMAIL \
+            columns. Every row is emailed using Gmail batch requests, as a draft \
+            or sent immediately with --send_now. Cannot be combined with the \
+            recruiter positional arguments. Overrides the \
+            {EnvironmentVariables.RECIPIENTS_CSV_PATH.value} environment variable",
+        nargs="?",
     )
     parser.add_argument(
         "-ap",
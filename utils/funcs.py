@@ -4,12 +4,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+TRUTHY_STRINGS = frozenset({"true", "1", "t", "y", "yes"})
+FALSY_STRINGS = frozenset({"false", "0", "f", "n", "no"})
+
 
 def str_to_bool(s: str) -> bool:
     """Convert a string to a boolean value."""
-    if s.lower() in ("true", "1", "t", "y", "yes"):
+    value = s.strip().casefold()
+    if value in TRUTHY_STRINGS:
         return True
-    if s.lower() in ("false", "0", "f", "n", "no"):
+    if value in FALSY_STRINGS:
         return False
     logger.warning("unknown value defaulting to false")
     return False
@@ -2,16 +2,74 @@
 
 import base64
 import logging
+import time
+from collections.abc import Callable
 from email.message import EmailMessage
+from http import HTTPStatus
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, MediaInMemoryUpload
 
 logger = logging.getLogger(__name__)
 SCOPES = ["https://mail.google.com/"]
+# Gmail recommends keeping batches to 50 requests to avoid rate limiting
+BATCH_SIZE = 50
+BATCH_DELAY_SECONDS = 1
+# Retry rate limited requests with exponential backoff. Only reads also retry
+# server and socket errors, since a create or send that failed that way may
+# still have gone through and must not be repeated.
+NUM_RETRIES = 3
+# Never wait longer than a minute between retries, even when Retry-After asks
+# for more, so a run gives up rather than hanging
+MAX_BACKOFF_SECONDS = 60
+
+
+def _is_rate_limited(exception: Exception) -> bool:
+    """Return whether Gmail rejected the request as rate limited."""
+    return (
+        isinstance(exception, HttpError)
+        and exception.resp.status == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+def _retry_delay(exception: HttpError, attempt: int) -> int:
+    """Return the seconds to wait before retry attempt, honouring Retry-After."""
+    delay = 2**attempt
+    retry_after = str(exception.resp.get("retry-after", ""))
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return min(delay, MAX_BACKOFF_SECONDS)
+
+
+def _execute_retrying_rate_limits(request: HttpRequest) -> dict:
+    """
+    Execute a request that must not be repeated, retrying only rate limits.
+
+    Args:
+        request (HttpRequest): The request to execute.
+
+    Returns:
+        dict: The response of the request.
+
+    Raises:
+        HttpError: If the request failed, or was still rate limited after
+            NUM_RETRIES retries.
+
+    """
+    for attempt in range(NUM_RETRIES):
+        try:
+            return request.execute()
+        except HttpError as exception:
+            if not _is_rate_limited(exception):
+                raise
+            delay = _retry_delay(exception, attempt)
+            logger.warning("Rate limited by Gmail, retrying in %d seconds", delay)
+            time.sleep(delay)
+    return request.execute()
 
 
 class GmailAPI:
@@ -81,15 +139,14 @@ class GmailAPI:
             dict: True if the draft was saved successfully, False otherwise.
 
         """
-        encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        # Upload the RFC 822 bytes as media instead of a base64 "raw" field, so
+        # large attachments are not encoded a second time on the client.
+        media = MediaInMemoryUpload(message.as_bytes(), mimetype="message/rfc822")
         try:
-            draft_message = {"message": {"raw": encoded_message}}
-            draft = (
-                self.service.users()
-                .drafts()
-                .create(userId="me", body=draft_message)
-                .execute()
+            request = (
+                self.service.users().drafts().create(userId="me", media_body=media)
             )
+            draft = _execute_retrying_rate_limits(request)
             logger.debug("Draft: %s", draft)
             logger.debug("Draft saved")
         except HttpError:
@@ -97,6 +154,150 @@ class GmailAPI:
             return False
         return draft
 
+    def save_drafts_batch(
+        self,
+        messages: list[EmailMessage],
+        batch_size: int = BATCH_SIZE,
+    ) -> list[dict | bool]:
+        """
+        Save several draft messages in Gmail using batch requests.
+
+        Args:
+            messages (list[EmailMessage]): The messages to save as drafts.
+            batch_size (int): The maximum number of drafts per batch request.
+
+        Returns:
+            list: The saved draft for each message, in the same order as messages.
+                An entry is False if that draft could not be saved.
+
+        """
+        drafts = self._execute_with_retries(
+            messages,
+            lambda raw: (
+                self.service.users()
+                .drafts()
+                .create(userId="me", body={"message": {"raw": raw}})
+            ),
+            batch_size,
+            "draft",
+        )
+        logger.debug("Saved %d of %d drafts", sum(map(bool, drafts)), len(messages))
+        return drafts
+
+    def send_now_batch(
+        self,
+        messages: list[EmailMessage],
+        batch_size: int = BATCH_SIZE,
+    ) -> list[dict | bool]:
+        """
+        Send several messages immediately using batch requests.
+
+        Args:
+            messages (list[EmailMessage]): The messages to send.
+            batch_size (int): The maximum number of messages per batch request.
+
+        Returns:
+            list: The sent message for each message, in the same order as messages.
+                An entry is False if that message could not be sent.
+
+        """
+        sent_messages = self._execute_with_retries(
+            messages,
+            lambda raw: (
+                self.service.users().messages().send(userId="me", body={"raw": raw})
+            ),
+            batch_size,
+            "message",
+        )
+        logger.info(
+            "Sent %d of %d messages", sum(map(bool, sent_messages)), len(messages)
+        )
+        return sent_messages
+
+    def _execute_with_retries(
+        self,
+        messages: list[EmailMessage],
+        make_request: Callable[[str], HttpRequest],
+        batch_size: int,
+        kind: str,
+    ) -> list[dict | bool]:
+        """
+        Run make_request for every message in batches, retrying rate limits.
+
+        Args:
+            messages (list[EmailMessage]): The messages to make requests for.
+            make_request (Callable): Builds the request for a base64url raw message.
+            batch_size (int): The maximum number of requests per batch request.
+            kind (str): What each request creates, used in log messages.
+
+        Returns:
+            list: The response for each message, in the same order as messages.
+                An entry is False if that request failed.
+
+        """
+        responses: list[dict | bool] = [False] * len(messages)
+        failed: dict[int, Exception] = {}
+
+        def callback(request_id: str, response: dict, exception: HttpError) -> None:
+            if exception is not None:
+                failed[int(request_id)] = exception
+                return
+            logger.debug("%s: %s", kind.capitalize(), response)
+            responses[int(request_id)] = response
+
+        pending = list(range(len(messages)))
+        for attempt in range(NUM_RETRIES + 1):
+            failed.clear()
+            self._execute_in_batches(
+                messages, pending, make_request, batch_size, callback
+            )
+
+            # Retry requests Gmail rate limited, reporting every other failure
+            pending = []
+            delay = 2**attempt
+            for index, exception in sorted(failed.items()):
+                if _is_rate_limited(exception) and attempt < NUM_RETRIES:
+                    pending.append(index)
+                    delay = max(delay, _retry_delay(exception, attempt))
+                else:
+                    logger.error(
+                        "An error occurred with %s %d: %s", kind, index, exception
+                    )
+            if not pending:
+                break
+            logger.warning(
+                "%d %ss were rate limited, retrying in %d seconds",
+                len(pending),
+                kind,
+                delay,
+            )
+            time.sleep(delay)
+        return responses
+
+    def _execute_in_batches(
+        self,
+        messages: list[EmailMessage],
+        indices: list[int],
+        make_request: Callable[[str], HttpRequest],
+        batch_size: int,
+        callback: Callable[[str, dict, HttpError], None],
+    ) -> None:
+        """Run make_request for messages[indices] in batch requests of batch_size."""
+        for start in range(0, len(indices), batch_size):
+            if start:
+                # Space out batches so Gmail does not reject them as rate limited
+                time.sleep(BATCH_DELAY_SECONDS)
+            batch = self.service.new_batch_http_request(callback=callback)
+            for index in indices[start : start + batch_size]:
+                encoded_message = base64.urlsafe_b64encode(
+                    messages[index].as_bytes()
+                ).decode()
+                batch.add(make_request(encoded_message), request_id=str(index))
+            try:
+                batch.execute()
+            except HttpError:
+                logger.exception("An error occurred executing the batch")
+
     def send_now(
         self,
         message: EmailMessage,
@@ -111,14 +312,13 @@ class GmailAPI:
             dict: True if the message was sent successfully, False otherwise.
 
         """
-        encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        # Upload the RFC 822 bytes as media, as save_draft does
+        media = MediaInMemoryUpload(message.as_bytes(), mimetype="message/rfc822")
         try:
-            sent_message = (
-                self.service.users()
-                .messages()
-                .send(userId="me", body={"raw": encoded_message})
-                .execute()
+            request = (
+                self.service.users().messages().send(userId="me", media_body=media)
             )
+            sent_message = _execute_retrying_rate_limits(request)
 
             logger.info(
                 "Message id: %s \nMessage: %s", sent_message["id"], sent_message
@@ -136,4 +336,8 @@ class GmailAPI:
             dict: The current user's information.
 
         """
-        return self.service.users().getProfile(userId="me").execute()
+        return (
+            self.service.users()
+            .getProfile(userId="me")
+            .execute(num_retries=NUM_RETRIES)
+        )
@@ -4,21 +4,59 @@ import csv
 import datetime
 import logging
 import random
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
 LOS_ANGELES_TZ = ZoneInfo("America/Los_Angeles")
 
+# Header of the schedule CSV, in the default column order
+SCHEDULE_COLUMNS = ("DAY", "START_TIME", "END_TIME")
+
+
+def parse_time(value: str) -> datetime.time:
+    """
+    Parse an HH:MM time from the schedule CSV.
+
+    Args:
+        value: The time, optionally surrounded by whitespace
+
+    Returns:
+        The parsed time
+
+    Raises:
+        ValueError: If the value is not H:MM or HH:MM
+
+    """
+    value = value.strip()
+    # fromisoformat alone would also accept "0900", seconds and UTC offsets,
+    # and an offset-aware time cannot be combined with the send date later
+    if len(value) not in (4, 5) or value[-3] != ":":
+        msg = f"Invalid time {value!r}, expected HH:MM"
+        raise ValueError(msg)
+    try:
+        # The C parser handles the usual zero padded HH:MM directly
+        return datetime.time.fromisoformat(value)
+    except ValueError:
+        # Still accept hours without zero padding, such as 9:00
+        hour, minute = map(int, value.split(":"))
+        return datetime.time(hour, minute)
+
 
 def parse_time_ranges_csv(
-    csv_reader: csv.DictReader,
+    csv_reader: Iterable[Sequence[str]],
+    columns: Sequence[int] = (0, 1, 2),
 ) -> list[list[tuple[datetime.time, datetime.time]]]:
     """
     Parse CSV data containing allowed time ranges and organize by day of week.
 
     Args:
-        csv_reader: csv.DictReader containing DAY, START_TIME, END_TIME
+        csv_reader: csv.reader positioned after the header row, with rows of
+            DAY, START_TIME, END_TIME
+        columns: Positions of the DAY, START_TIME and END_TIME columns
 
     Returns:
         List of 7 lists (one per day of week), in format (start_time, end_time)
@@ -26,16 +64,17 @@ def parse_time_ranges_csv(
     """
     # Initialize empty list for each day of the week (Monday-Sunday)
     day_ranges = [[] for _ in range(7)]
+    day_column, start_time_column, end_time_column = columns
 
     for row in csv_reader:
-        day = int(row["DAY"])
+        if not row:
+            # Skip blank lines, such as a trailing newline
+            continue
+        day = int(row[day_column])
 
         # Parse start and end times
-        start_hour, start_minute = map(int, row["START_TIME"].split(":"))
-        end_hour, end_minute = map(int, row["END_TIME"].split(":"))
-
-        start_time = datetime.time(start_hour, start_minute)
-        end_time = datetime.time(end_hour, end_minute)
+        start_time = parse_time(row[start_time_column])
+        end_time = parse_time(row[end_time_column])
 
         # Add the time range to the appropriate day
         day_ranges[day].append((start_time, end_time))
@@ -47,8 +86,50 @@ def parse_time_ranges_csv(
     return day_ranges
 
 
+def load_time_ranges_csv(
+    csv_path: Path,
+) -> tuple[tuple[tuple[datetime.time, datetime.time], ...], ...]:
+    """
+    Load the allowed time ranges from a schedule CSV file.
+
+    The columns are found by name in the header, so they may be in any order.
+    The parsed ranges are cached by path and modification time, so the file is
+    only parsed again after it changes. This only saves work for callers that
+    load the same file more than once in one process; the script loads it once
+    per run. The ranges are returned as tuples so the cached result cannot be
+    modified by a caller.
+
+    Args:
+        csv_path: Path to a CSV file with DAY, START_TIME, END_TIME columns
+
+    Returns:
+        Tuple of 7 tuples (one per day of week), in format (start_time, end_time)
+
+    Raises:
+        ValueError: If the header is missing one of the columns
+
+    """
+    return _load_time_ranges_csv(str(csv_path), csv_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _load_time_ranges_csv(
+    csv_path: str,
+    mtime_ns: int,  # noqa: ARG001 part of the cache key
+) -> tuple[tuple[tuple[datetime.time, datetime.time], ...], ...]:
+    with Path(csv_path).open("r") as file:
+        csv_reader = csv.reader(file)
+        header = [column.strip() for column in next(csv_reader, [])]
+        missing = [column for column in SCHEDULE_COLUMNS if column not in header]
+        if missing:
+            msg = f"Schedule CSV {csv_path} is missing columns: {', '.join(missing)}"
+            raise ValueError(msg)
+        columns = [header.index(column) for column in SCHEDULE_COLUMNS]
+        return tuple(map(tuple, parse_time_ranges_csv(csv_reader, columns)))
+
+
 def get_scheduled_send_time(
-    day_ranges: list[list[tuple[datetime.time, datetime.time]]],
+    day_ranges: Sequence[Sequence[tuple[datetime.time, datetime.time]]],
     timezone: str = "UTC",
     cur_time: datetime.datetime | None = None,
 ) -> bool | datetime.datetime:
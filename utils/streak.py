@@ -2,11 +2,22 @@
 
 import datetime
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
 from typing import NamedTuple
 
 import requests
 
 logger = logging.getLogger(__name__)
+# Retry requests Streak rejects as rate limited with exponential backoff
+MAX_RETRIES = 3
+# Never wait longer than a minute between retries, even when Retry-After asks
+# for more, matching the Gmail retries
+MAX_BACKOFF_SECONDS = 60
+# Maximum number of concurrent requests to Streak
+MAX_WORKERS = 4
 headers = {
     "accept": "*/*",
     "accept-language": "en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7",
@@ -52,9 +63,22 @@ class StreakSendLaterConfig(NamedTuple):
 
 def schedule_send_later(
     config: StreakSendLaterConfig,
+    session: requests.Session | None = None,
 ) -> bool:
-    """Schedule an email to be sent later using Streak."""
-    headers["authorization"] = f"Bearer {config.token}"
+    """
+    Schedule an email to be sent later using Streak.
+
+    Args:
+        config: The send later configuration for the email.
+        session: A session whose pooled connections are reused for the request.
+            Defaults to None, which opens a new connection.
+
+    Returns:
+        Whether the email was scheduled.
+
+    """
+    post = requests.post if session is None else session.post
+    request_headers = {**headers, "authorization": f"Bearer {config.token}"}
     # convert config.send_date to UTC
     send_date = config.send_date.astimezone(datetime.UTC)
     data = {
@@ -71,17 +95,28 @@ def schedule_send_later(
     params = {
         "email": config.email_address,
     }
-    try:
-        response = requests.post(
-            "https://api.streak.com/api/v2/sendlaters",
-            params=params,
-            headers=headers,
-            data=data,
-            timeout=10,
-        )
-    except requests.RequestException:
-        logger.exception("Error scheduling email to be sent later: %s")
-        return False
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = post(
+                "https://api.streak.com/api/v2/sendlaters",
+                params=params,
+                headers=request_headers,
+                data=data,
+                timeout=10,
+            )
+        except requests.RequestException:
+            logger.exception("Error scheduling email to be sent later: %s")
+            return False
+        if (
+            response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+            or attempt == MAX_RETRIES
+        ):
+            break
+        retry_after = response.headers.get("Retry-After", "")
+        delay = int(retry_after) if retry_after.isdigit() else 2**attempt
+        delay = min(delay, MAX_BACKOFF_SECONDS)
+        logger.warning("Rate limited by Streak, retrying in %d seconds", delay)
+        time.sleep(delay)
 
     if not response.ok:
         logger.error("Failed to schedule email to be sent later")
@@ -89,3 +124,37 @@ def schedule_send_later(
         return False
     logger.info("Email scheduled to be sent at %s", config.send_date)
     return True
+
+
+def schedule_send_later_many(
+    configs: list[StreakSendLaterConfig],
+    max_workers: int = MAX_WORKERS,
+) -> list[bool]:
+    """
+    Schedule several emails to be sent later using Streak concurrently.
+
+    Args:
+        configs: The send later configuration for each email.
+        max_workers: The maximum number of requests to Streak in flight at once.
+
+    Returns:
+        Whether each email was scheduled, in the same order as configs.
+
+    """
+    # requests.Session is not thread safe, so each worker gets its own and
+    # reuses its connection to Streak for every config it schedules
+    local = threading.local()
+    sessions = []
+
+    def schedule(config: StreakSendLaterConfig) -> bool:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            sessions.append(local.session)
+        return schedule_send_later(config, session=local.session)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(schedule, configs))
+    finally:
+        for session in sessions:
+            session.close()